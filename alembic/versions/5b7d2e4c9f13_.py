@@ -0,0 +1,26 @@
+"""empty message
+
+Revision ID: 5b7d2e4c9f13
+Revises: c3e1f8a92b4d
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7d2e4c9f13'
+down_revision = 'c3e1f8a92b4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('laps', 'start_time', server_default=sa.func.now())
+    op.alter_column('races', 'start_time', server_default=sa.func.now())
+
+
+def downgrade():
+    op.alter_column('races', 'start_time', server_default=None)
+    op.alter_column('laps', 'start_time', server_default=None)
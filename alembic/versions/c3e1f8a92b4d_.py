@@ -0,0 +1,26 @@
+"""empty message
+
+Revision ID: c3e1f8a92b4d
+Revises: 92aaa0537da3
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e1f8a92b4d'
+down_revision = '92aaa0537da3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_laps_start_time_desc', 'laps', [sa.text('start_time DESC')], unique=False)
+    op.create_index('ix_races_start_time_desc', 'races', [sa.text('start_time DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_races_start_time_desc', table_name='races')
+    op.drop_index('ix_laps_start_time_desc', table_name='laps')
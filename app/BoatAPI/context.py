@@ -1,3 +1,6 @@
+import logging
+import traceback
+
 from app.BoatAPI import BoatAPI
 
 
@@ -6,11 +9,24 @@ class AppContext:
         self.redis = app.redis.get_session()
         self.session = app.db.get_session()
 
-    async def close(self):
+    async def close(self, commit=True):
         await self.redis.close()
-        self.session.commit()
+        if commit:
+            self.session.commit()
+        else:
+            self.session.rollback()
         self.session.close()
 
     @staticmethod
-    async def done_callback(ctx, *args):
-        await ctx.close()
+    async def done_callback(ctx, task=None):
+        failed = False
+        if task is not None:
+            if task.cancelled():
+                failed = True
+            elif task.exception() is not None:
+                # retrieving the exception silences asyncio's own report, so log it here
+                exc = task.exception()
+                logging.log(logging.ERROR, exc)
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                failed = True
+        await ctx.close(commit=not failed)
@@ -3,6 +3,12 @@ import os
 from dataclasses import dataclass
 
 CURRENT_STATE_KEY = 'current_state'
+TELEMETRY_LAST_SAVED_KEY = 'telemetry_last_saved_at'
 TELEMETRY_REMEMBER_DELAY = 3
+CURRENT_STATE_CACHE_TTL = 0.1
 LAP_ADD_RADIUS_METERS = 5
+TELEMETRY_BATCH_SIZE = 200
+TELEMETRY_BATCH_DELAY = 0.5
+TELEMETRY_QUEUE_SIZE = 10000
+TELEMETRY_WRITE_RETRIES = 5
 
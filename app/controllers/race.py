@@ -1,4 +1,4 @@
-from datetime import datetime
+from sqlalchemy import func
 
 from app.BoatAPI.context import AppContext
 from app.controllers.laps import LapsController
@@ -13,7 +13,6 @@ class RaceController:
     async def start_new_race(self, ctx: AppContext):
         cur_state = await State.get_current_state(ctx)
         new_race = Race(
-            start_time=datetime.now(),
             start_pos_lat=cur_state.position_lat,
             start_pos_lng=cur_state.position_lng)
         new_race.save(ctx)
@@ -24,7 +23,7 @@ class RaceController:
         race = await Race.get_current_race(ctx)
         if race is None:
             raise ValueError("no race to stop")
-        race.finish_time = datetime.now()
+        race.finish_time = func.now()
         race.save(ctx)
         cur_state = await State.get_current_state(ctx)
         self.laps.finish(cur_state.distance_travelled, ctx)
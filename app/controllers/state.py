@@ -1,3 +1,7 @@
+import asyncio
+import math
+from typing import Optional
+
 import app.utils.coordinates as coord_utils
 from app import constants
 from app.BoatAPI.context import AppContext
@@ -8,28 +12,43 @@ from app.entities.status import TelemetrySaveStatus
 from app.entities.telemetry import Telemetry
 from app.models import Race
 from app.models.lap import Lap
-from app.models.state import State as StateModel
+
+_LAP_RADIUS = constants.LAP_ADD_RADIUS_METERS
 
 
 class StateController:
     def __init__(self, laps_controller: LapsController):
         self.laps = laps_controller
+        self._cached_state = None
+        self._cached_at = None
+        self._cache_lock = asyncio.Lock()
+
+    def _cache_fresh(self, now):
+        return self._cached_at is not None and now - self._cached_at < constants.CURRENT_STATE_CACHE_TTL
+
+    async def get_current_state(self, ctx: AppContext) -> State:
+        loop = asyncio.get_running_loop()
+        if self._cache_fresh(loop.time()):
+            return self._cached_state
+        # concurrent readers wait for a single Redis read instead of issuing their own
+        async with self._cache_lock:
+            if not self._cache_fresh(loop.time()):
+                self._cached_state = await State.get_current_state(ctx)
+                self._cached_at = loop.time()
+        return self._cached_state
 
     async def save_current_state(self, telemetry: Telemetry, ctx: AppContext):
-        state = await self.from_telemetry(telemetry, ctx)
-        status = await state.save(ctx)
+        prev, last_saved_at = await State.get_current_state_and_last_saved_at(ctx)
+        state = await self.from_telemetry(telemetry, prev, ctx)
+        status = await state.save(ctx, prev, last_saved_at)
         if status == TelemetrySaveStatus.PERM_SAVED:
-            state = StateModel.get_last(ctx)
             land_data = LandData.from_state(state)
             land_data.save(ctx)
             await ctx.redis.publish(ctx.redis.config.land_queue_channel, land_data.json())
 
-    async def count_laps(self, current: State, previous: State, ctx: AppContext):
-        prev_dist = coord_utils.count_distance(previous.position_lat, previous.position_lng,
-                                               current.lap_point_lat, current.lap_point_lng).m
-        cur_dist = coord_utils.count_distance(current.position_lat, current.position_lng,
-                                              current.lap_point_lat, current.lap_point_lng).m
-        if prev_dist > constants.LAP_ADD_RADIUS_METERS >= cur_dist:
+    async def count_laps(self, current: State, previous: State, prev_dist: float, cur_dist: float,
+                         ctx: AppContext):
+        if prev_dist > _LAP_RADIUS >= cur_dist:
             current.laps += 1
             prev_lap = Lap.get_current_lap(ctx)
             if prev_lap:
@@ -38,14 +57,11 @@ class StateController:
             else:
                 race = await Race.get_current_race(ctx)
                 await self.laps.create_lap(ctx, race, previous.laps)
-            ctx.session.commit()
+            ctx.session.flush()
 
-    async def from_telemetry(self, telemetry: Telemetry, ctx: AppContext):
+    async def from_telemetry(self, telemetry: Telemetry, prev: Optional[State], ctx: AppContext):
         res = State(**telemetry.dict())
-
-        try:
-            prev = await State.get_current_state(ctx)
-        except FileNotFoundError:
+        if prev is None:
             return res
 
         await self._update_from_previous_state(res, prev, ctx)
@@ -54,54 +70,74 @@ class StateController:
     async def _update_from_previous_state(self, current: State, previous: State, ctx: AppContext):
         distance = coord_utils.count_distance(previous.position_lat, previous.position_lng,
                                               current.position_lat, current.position_lng)
+        lap_point_set = previous.lap_point_lng is not None and previous.lap_point_lat is not None
+        prev_dist = cur_dist = math.inf
+        if lap_point_set:
+            lap_lat, lap_lng = previous.lap_point_lat, previous.lap_point_lng
+            cos_lap = coord_utils.cos_lat(lap_lat)
+            # the lap can only be counted when the boat is within the radius, so the
+            # exact check is skipped while the cheap estimate is clearly outside of it
+            if coord_utils.approx_distance(current.position_lat, current.position_lng,
+                                           lap_lat, lap_lng, cos_lap) <= 2 * _LAP_RADIUS:
+                prev_dist = coord_utils.haversine_distance(
+                    previous.position_lat, previous.position_lng, lap_lat, lap_lng,
+                    coord_utils.cos_lat(previous.position_lat), cos_lap)
+                cur_dist = coord_utils.haversine_distance(
+                    current.position_lat, current.position_lng, lap_lat, lap_lng,
+                    coord_utils.cos_lat(current.position_lat), cos_lap)
+        distance_km = distance / 1000
 
-        current.speed = coord_utils.count_speed(current.created_at, previous.created_at, distance)
-        current.distance_travelled = previous.distance_travelled + distance.km
+        current.speed = coord_utils.count_speed(current.created_at, previous.created_at,
+                                                distance_km, previous.speed)
+        current.distance_travelled = previous.distance_travelled + distance_km
         current.laps = previous.laps
         current.lap_point_lat = previous.lap_point_lat
         current.lap_point_lng = previous.lap_point_lng
 
         race = await Race.get_current_race(ctx)
-        if current.lap_point_lng is not None and current.lap_point_lat is not None and race is not None:
-            await self.count_laps(current, previous, ctx)
+        if lap_point_set and race is not None:
+            await self.count_laps(current, previous, prev_dist, cur_dist, ctx)
         current_lap = Lap.get_current_lap(ctx)
         if current_lap:
             current.lap_id = current_lap.id
 
     @staticmethod
     async def set_point(ctx: AppContext) -> PointSet:
-        prev = await State.get_current_state(ctx)
-        prev.lap_point_lng = prev.position_lng
-        prev.lap_point_lat = prev.position_lat
-        prev.laps = 0
-        await prev._save_redis(ctx)
-        return PointSet(lng=prev.lap_point_lng, lat=prev.lap_point_lat)
+        state = await State.update_current_state(ctx, _SET_LAP_POINT)
+        return PointSet(lng=state.lap_point_lng, lat=state.lap_point_lat)
 
     @staticmethod
     async def reset_point(ctx: AppContext) -> None:
-        prev = await State.get_current_state(ctx)
-        prev.lap_point_lng = None
-        prev.lap_point_lat = None
-        prev.laps = 0
-        await prev._save_redis(ctx)
+        await State.update_current_state(ctx, _RESET_LAP_POINT)
 
     @staticmethod
     async def reset_distance(ctx: AppContext) -> None:
-        prev = await State.get_current_state(ctx)
-        prev.distance_travelled = 0
-        await prev._save_redis(ctx)
+        await State.update_current_state(ctx, _RESET_DISTANCE)
 
     @staticmethod
     async def remove_point(ctx: AppContext):
-        prev = await State.get_current_state(ctx)
-        prev.lap_point_lng = None
-        prev.lap_point_lat = None
-        prev.laps = 0
-        await prev._save_redis(ctx)
-        return PointSet(lng=prev.lap_point_lng, lat=prev.lap_point_lat)
+        state = await State.update_current_state(ctx, _RESET_LAP_POINT)
+        return PointSet(lng=state.lap_point_lng, lat=state.lap_point_lat)
 
     @staticmethod
     async def clear_distance(ctx: AppContext):
-        prev = await State.get_current_state(ctx)
-        prev.distance_travelled = 0
-        await prev._save_redis(ctx)
+        await State.update_current_state(ctx, _RESET_DISTANCE)
+
+
+
+# Lua snippets applied to the stored state by State.update_current_state
+_SET_LAP_POINT = """
+state.lap_point_lng = state.position_lng
+state.lap_point_lat = state.position_lat
+state.laps = 0
+"""
+
+_RESET_LAP_POINT = """
+state.lap_point_lng = nil
+state.lap_point_lat = nil
+state.laps = 0
+"""
+
+_RESET_DISTANCE = """
+state.distance_travelled = 0
+"""
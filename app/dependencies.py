@@ -8,10 +8,15 @@ async def get_context():
         raise NotImplementedError("app not configured")
 
     ctx = AppContext(app)
+    failed = False
     try:
         yield ctx
+    except BaseException:
+        # BaseException also covers CancelledError from a dropped client
+        failed = True
+        raise
     finally:
-        await ctx.close()
+        await ctx.close(commit=not failed)
 
 
 async def controllers_dep():
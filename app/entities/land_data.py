@@ -6,7 +6,6 @@ from pydantic import BaseModel
 
 from app.BoatAPI.context import AppContext
 from app.entities.state import State
-from app.models.state import State as StateModel
 from app.models.land_data import LandData as LandDataModel
 
 
@@ -30,7 +29,6 @@ class LandData(BaseModel):
         self.id = land_data.id
 
     @staticmethod
-    def from_state(state: StateModel):
-        state = State.from_orm(state)
-        data = LandData(priority=LandData.Priority.low, data=state.json(), created_at=datetime.now())
+    def from_state(state: State):
+        data = LandData(priority=LandData.Priority.low, data=state.to_bytes().decode(), created_at=datetime.now())
         return data
@@ -1,15 +1,34 @@
-import json
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+from typing import Optional
 
+import orjson
 from pydantic import BaseModel
 
 from app import constants
 from app.BoatAPI.context import AppContext
 from app.entities.status import TelemetrySaveStatus
 from app.models.state import State as StateModel
+from background.telemetry_writer import get_telemetry_writer
 
 
-class State(BaseModel):
+# reads the stored state, applies the update body to the decoded `state` table
+# and writes it back, all in one round-trip
+_UPDATE_STATE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return false
+end
+local state = cjson.decode(raw)
+%s
+raw = cjson.encode(state)
+redis.call('SET', KEYS[1], raw)
+return raw
+"""
+
+
+@dataclass
+class State:
     created_at: datetime
     controller_watts: int
     time_to_go: int
@@ -23,47 +42,85 @@ class State(BaseModel):
     speed: float = 0
     distance_travelled: float = 0
     laps: int = 0
-    lap_point_lat: float = None
-    lap_point_lng: float = None
-    lap_id: int = None
-
-    class Config:
-        orm_mode = True
+    lap_point_lat: Optional[float] = None
+    lap_point_lng: Optional[float] = None
+    lap_id: Optional[int] = None
 
     @staticmethod
     async def get_current_state(ctx: AppContext):
+        cur = await State.get_current_state_or_none(ctx)
+        if cur is None:
+            raise FileNotFoundError("Key not found")
+        return cur
+
+    @staticmethod
+    async def get_current_state_or_none(ctx: AppContext) -> Optional["State"]:
         cur = await ctx.redis.get(constants.CURRENT_STATE_KEY)
+        return State.from_bytes(cur) if cur is not None else None
+
+    @staticmethod
+    async def get_current_state_and_last_saved_at(ctx: AppContext):
+        cur, last_saved_at = await ctx.redis.mget(constants.CURRENT_STATE_KEY,
+                                                  constants.TELEMETRY_LAST_SAVED_KEY)
+        cur = State.from_bytes(cur) if cur is not None else None
+        last_saved_at = datetime.fromisoformat(last_saved_at) if last_saved_at is not None else None
+        return cur, last_saved_at
+
+    @staticmethod
+    async def update_current_state(ctx: AppContext, update: str) -> "State":
+        # update is a Lua snippet mutating the `state` table
+        cur = await ctx.redis.run_script(_UPDATE_STATE_SCRIPT % update,
+                                         [constants.CURRENT_STATE_KEY])
         if cur is None:
             raise FileNotFoundError("Key not found")
-        return State(**json.loads(cur))
+        return State.from_bytes(cur)
 
     @staticmethod
     def get_pg_state(ctx: AppContext):
         return StateModel.get_last(ctx)
 
-    async def _save_redis(self, ctx: AppContext):
-        await ctx.redis.set(constants.CURRENT_STATE_KEY, self.json())
+    @staticmethod
+    def get_pg_last_saved_at(ctx: AppContext):
+        prev = State.get_pg_state(ctx)
+        return prev.created_at if prev else None
+
+    @staticmethod
+    def from_bytes(raw) -> "State":
+        payload = orjson.loads(raw)
+        payload['created_at'] = datetime.fromisoformat(payload['created_at'])
+        return State(**payload)
+
+    def to_bytes(self) -> bytes:
+        return orjson.dumps(asdict(self))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
 
     def _save_pg(self, ctx: AppContext):
-        StateModel.save_from_schema(self, ctx)
+        writer = get_telemetry_writer()
+        if writer is None or not writer.put(self.to_dict()):
+            # TELEMETRY_LAST_SAVED_KEY is advanced after this returns, so the row
+            # must be committed by then rather than at the end of the request
+            StateModel.save_from_dict(self.to_dict(), ctx)
+            ctx.session.commit()
 
-    async def save(self, ctx: AppContext):
-        try:
-            prev = await State.get_current_state(ctx)
-        except FileNotFoundError:
-            await self._save_redis(ctx)
-            self._save_pg(ctx)
-            return TelemetrySaveStatus.PERM_SAVED
+    async def save(self, ctx: AppContext, prev: Optional["State"],
+                   last_saved_at: Optional[datetime]):
+        values = {}
+        if prev is None or prev.created_at < self.created_at:
+            values[constants.CURRENT_STATE_KEY] = self.to_bytes()
 
-        if prev.created_at < self.created_at:
-            await self._save_redis(ctx)
-        prev = State.get_pg_state(ctx)
-        if prev is None or self.created_at - prev.created_at > timedelta(seconds=constants.TELEMETRY_REMEMBER_DELAY):
+        if last_saved_at is None:
+            last_saved_at = State.get_pg_last_saved_at(ctx)
+        perm = last_saved_at is None or \
+            self.created_at - last_saved_at > timedelta(seconds=constants.TELEMETRY_REMEMBER_DELAY)
+        if perm:
             self._save_pg(ctx)
-            ctx.session.commit()
-            return TelemetrySaveStatus.PERM_SAVED
-        else:
-            return TelemetrySaveStatus.TEMP_SAVED
+            values[constants.TELEMETRY_LAST_SAVED_KEY] = self.created_at.isoformat()
+
+        if values:
+            await ctx.redis.mset(values)
+        return TelemetrySaveStatus.PERM_SAVED if perm else TelemetrySaveStatus.TEMP_SAVED
 
 
 class PointSet(BaseModel):
@@ -7,6 +7,7 @@ from app.config.config import Config
 from app.controllers import Controllers
 from app.routers import state, serial, actions, websockets, race
 from background.listener import create_listener, get_listener
+from background.telemetry_writer import create_telemetry_writer, get_telemetry_writer
 from store.migrator import AlembicMigrator
 
 api = FastAPI()
@@ -33,6 +34,8 @@ async def startup_event():
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    writer = create_telemetry_writer()
+    await writer.start()
     listener = create_listener()
     await listener.listen()
 
@@ -40,6 +43,7 @@ async def startup_event():
 @api.on_event("shutdown")
 async def shutdown_event():
     await get_listener().stop()
+    await get_telemetry_writer().stop()
 
 
 @api.get("/")
@@ -24,5 +24,4 @@ class LandData(Base):
 
     @staticmethod
     def get_by_id(land_data_id: int, ctx: AppContext):
-        land_data = ctx.session.query(LandData).filter_by(id=land_data_id).first()
-        return land_data
\ No newline at end of file
+        return ctx.session.get(LandData, land_data_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey, Index, func, select
 from sqlalchemy.orm import relationship
 
 from app.BoatAPI.context import AppContext
@@ -9,17 +9,22 @@ class Lap(Base):
     __tablename__ = "laps"
 
     id = Column(Integer, primary_key=True)
-    start_time = Column(DateTime)
+    start_time = Column(DateTime, server_default=func.now())
     end_time = Column(DateTime)
     distance = Column(Float)
     lap_number = Column(Integer)
     race_id = Column(Integer, ForeignKey("races.id"))
     race = relationship("Race", back_populates="laps")
 
+    __table_args__ = (
+        Index("ix_laps_start_time_desc", start_time.desc()),
+    )
+
     def save(self, ctx: AppContext):
         ctx.session.add(self)
 
     @staticmethod
     def get_current_lap(ctx: AppContext):
-        lap = ctx.session.query(Lap).order_by(Lap.start_time.desc()).first()
+        stmt = select(Lap).order_by(Lap.start_time.desc()).limit(1)
+        lap = ctx.session.execute(stmt).scalar_one_or_none()
         return lap if lap and not lap.end_time else None
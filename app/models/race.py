@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, String, Float
+from sqlalchemy import Column, Integer, DateTime, String, Float, Index, func, select
 from sqlalchemy.orm import relationship
 
 from app.BoatAPI.context import AppContext
@@ -9,17 +9,22 @@ class Race(Base):
     __tablename__ = "races"
 
     id = Column(Integer, primary_key=True)
-    start_time = Column(DateTime)
+    start_time = Column(DateTime, server_default=func.now())
     finish_time = Column(DateTime)
     boat_name = Column(String)
     start_pos_lat = Column(Float)
     start_pos_lng = Column(Float)
     laps = relationship("Lap", back_populates="race")
 
+    __table_args__ = (
+        Index("ix_races_start_time_desc", start_time.desc()),
+    )
+
     def save(self, ctx: AppContext):
         ctx.session.add(self)
 
     @staticmethod
     async def get_current_race(ctx: AppContext):
-        race = ctx.session.query(Race).order_by(Race.start_time.desc()).first()
+        stmt = select(Race).order_by(Race.start_time.desc()).limit(1)
+        race = ctx.session.execute(stmt).scalar_one_or_none()
         return race if race and not race.finish_time else None
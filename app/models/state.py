@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, select
 from sqlalchemy.types import DateTime, Integer, Float
 
 from app.BoatAPI.context import AppContext
@@ -30,11 +30,11 @@ class State(Base):
         ctx.session.add(self)
 
     @staticmethod
-    def save_from_schema(schema, ctx: AppContext):
-        telemetry = State(**schema.dict())
+    def save_from_dict(data: dict, ctx: AppContext):
+        telemetry = State(**data)
         telemetry.save(ctx)
 
     @staticmethod
     def get_last(ctx: AppContext):
-        res = ctx.session.query(State).order_by(State.id.desc()).first()
-        return res
+        stmt = select(State).order_by(State.id.desc()).limit(1)
+        return ctx.session.execute(stmt).scalar_one_or_none()
@@ -18,8 +18,9 @@ async def post_current_state(telemetry: Telemetry, ctx: AppContext = Depends(get
 
 
 @router.get("/", response_model=State)
-async def get_current_state(ctx: AppContext = Depends(get_context)):
+async def get_current_state(ctx: AppContext = Depends(get_context),
+                            controllers: Controllers = Depends(controllers_dep)):
     try:
-        return await State.get_current_state(ctx)
+        return await controllers.state_controller.get_current_state(ctx)
     except FileNotFoundError:
         return JSONResponse(status_code=404, content={'message': 'key not found'})
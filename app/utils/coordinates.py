@@ -1,15 +1,36 @@
+import math
 from datetime import datetime
 
-import geopy.distance
+from pyproj import Geod
 
+_GEOD_INV = Geod(ellps="WGS84").inv
+METERS_PER_DEGREE = 111320.0
+EARTH_DIAMETER_METERS = 12742000.0
 
-def count_distance(lat1, lng1, lat2, lng2) -> geopy.distance.Distance:
-    coord1 = (lat1, lng1)
-    coord2 = (lat2, lng2)
-    return geopy.distance.geodesic(coord1, coord2)
 
+def count_distance(lat1, lng1, lat2, lng2):
+    _, _, distance = _GEOD_INV(lng1, lat1, lng2, lat2)
+    return distance
 
-def count_speed(time1: datetime, time2: datetime, distance: geopy.distance.Distance):
-    delta = (abs(time1 - time2)).seconds / 3600
 
-    return distance.km / max(delta, 1)
+def haversine_distance(lat1, lng1, lat2, lng2, cos_lat1, cos_lat2):
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(d_lambda / 2) ** 2
+    return EARTH_DIAMETER_METERS * math.asin(math.sqrt(a))
+
+
+def cos_lat(lat):
+    return math.cos(math.radians(lat))
+
+
+def approx_distance(lat1, lng1, lat2, lng2, cos_lat2):
+    dlat = (lat1 - lat2) * METERS_PER_DEGREE
+    dlng = (lng1 - lng2) * METERS_PER_DEGREE * cos_lat2
+    return math.hypot(dlat, dlng)
+
+
+def count_speed(time1: datetime, time2: datetime, distance_km: float, fallback: float):
+    delta = (time1 - time2).total_seconds() / 3600
+
+    return distance_km / delta if delta > 1e-9 else fallback
@@ -6,8 +6,9 @@ import traceback
 import async_timeout
 from redis.asyncio.client import PubSub
 
+from app.BoatAPI import get_app
 from app.BoatAPI.context import AppContext
-from app.dependencies import get_context, controllers_dep
+from app.dependencies import controllers_dep
 from app.entities.land_ack import LandAck
 from app.entities.telemetry import Telemetry
 from app.models.serial import SerialConfig
@@ -22,7 +23,8 @@ class Listener:
         self.pubsub = None
 
     async def get_context(self):
-        return await get_context().__anext__()
+        # the context is closed by AppContext.done_callback once the handler task finishes
+        return AppContext(get_app())
 
     async def get_controllers(self):
         return await controllers_dep().__anext__()
@@ -42,14 +44,14 @@ class Listener:
         ctx = await self.get_context()
         controllers = await self.get_controllers()
         task = asyncio.create_task(controllers.state_controller.save_current_state(telemetry, ctx))
-        task.add_done_callback(lambda context: asyncio.create_task(AppContext.done_callback(ctx)))
+        task.add_done_callback(lambda done: asyncio.create_task(AppContext.done_callback(ctx, done)))
 
     async def listen_config(self, msg):
         data = json.loads(msg['data'])
         cfg = SerialConfig(**data['config'])
         ctx = await self.get_context()
         task = asyncio.create_task(cfg.update(ctx))
-        task.add_done_callback(lambda context: asyncio.create_task(AppContext.done_callback(ctx)))
+        task.add_done_callback(lambda done: asyncio.create_task(AppContext.done_callback(ctx, done)))
 
     async def listen_connector_events(self, msg):
         data = json.loads(msg['data'])
@@ -57,7 +59,7 @@ class Listener:
         ctx = await self.get_context()
         controllers = await self.get_controllers()
         task = asyncio.create_task(controllers.land_data_controller.save_sending_time(ack, ctx))
-        task.add_done_callback(lambda context: asyncio.create_task(AppContext.done_callback(ctx)))
+        task.add_done_callback(lambda done: asyncio.create_task(AppContext.done_callback(ctx, done)))
 
     async def stop(self):
         self.task.cancel()
@@ -0,0 +1,131 @@
+import asyncio
+import io
+import logging
+import traceback
+
+import psycopg2
+from sqlalchemy.exc import OperationalError
+
+from app import constants
+from app.BoatAPI import get_app
+from app.models.state import State as StateModel
+
+writer = None
+_STOP = object()
+_CONNECTION_ERRORS = (OperationalError, psycopg2.OperationalError, psycopg2.InterfaceError)
+
+COLUMNS = [column.name for column in StateModel.__table__.columns if column.name != 'id']
+COPY_SQL = 'COPY {} ({}) FROM STDIN'.format(StateModel.__tablename__,
+                                             ', '.join(f'"{column}"' for column in COLUMNS))
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+class TelemetryWriter:
+
+    def __init__(self):
+        self.task = None
+        self.stopped = False
+        self.queue = asyncio.Queue(maxsize=constants.TELEMETRY_QUEUE_SIZE)
+
+    def put(self, row: dict) -> bool:
+        # False tells the caller to save the row itself
+        if self.stopped:
+            return False
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.stopped = True
+        await self.queue.put(_STOP)
+        await self.task
+        batch = []
+        while not self.queue.empty():
+            row = self.queue.get_nowait()
+            if row is not _STOP:
+                batch.append(row)
+        if batch:
+            await self.flush(batch)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self.queue.get()
+            if row is _STOP:
+                break
+            batch = [row]
+            deadline = loop.time() + constants.TELEMETRY_BATCH_DELAY
+            while len(batch) < constants.TELEMETRY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self.flush(batch)
+
+    async def flush(self, batch):
+        # the database being unreachable fails every row the same way, so back off
+        # and retry the whole batch instead of trying the rows one by one
+        delay = constants.TELEMETRY_BATCH_DELAY
+        for _ in range(constants.TELEMETRY_WRITE_RETRIES):
+            try:
+                await asyncio.to_thread(self.write, batch)
+                return
+            except _CONNECTION_ERRORS as exc:
+                logging.log(logging.ERROR, "telemetry write failed, retrying in %s s: %s",
+                            delay, exc)
+                await asyncio.sleep(delay)
+                delay *= 2
+            except Exception as exc:
+                logging.log(logging.ERROR, exc)
+                traceback.print_exc()
+                break
+        else:
+            logging.log(logging.ERROR, "telemetry batch of %s rows lost", len(batch))
+            return
+        # retry row by row, so a bad row only loses itself instead of the whole batch
+        for row in batch:
+            try:
+                await asyncio.to_thread(self.write, [row])
+            except Exception as exc:
+                logging.log(logging.ERROR, "telemetry row %s lost: %s", row['created_at'], exc)
+
+    @staticmethod
+    def write(batch):
+        buf = io.StringIO()
+        for row in batch:
+            buf.write('\t'.join(_copy_value(row[column]) for column in COLUMNS))
+            buf.write('\n')
+        buf.seek(0)
+
+        with get_app().db.get_session() as session, session.begin():
+            cursor = session.connection().connection.cursor()
+            cursor.copy_expert(COPY_SQL, buf)
+
+
+def create_telemetry_writer():
+    global writer
+    writer = TelemetryWriter()
+    return writer
+
+
+def get_telemetry_writer():
+    global writer
+    return writer
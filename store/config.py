@@ -7,6 +7,9 @@ class PostgresConfig(BaseSettings):
     server: str = '127.0.0.1'
     user: str  = 'postgres'
     port: int = '5433'
+    pool_size: int = 20
+    max_overflow: int = 40
+    pool_recycle: int = 1800
 
     class Config:
         env_prefix = 'postgres_'
@@ -19,8 +19,12 @@ class PostgresDB:
 
     def _make_factory(self) -> sessionmaker:
         pg_dsn = self._get_dsn()
-        engine = create_engine(pg_dsn)
-        session_factory = sessionmaker(engine)
+        engine = create_engine(pg_dsn,
+                               pool_size=self.config.pool_size,
+                               max_overflow=self.config.max_overflow,
+                               pool_recycle=self.config.pool_recycle,
+                               pool_pre_ping=True)
+        session_factory = sessionmaker(engine, expire_on_commit=False, autoflush=False)
         return session_factory
 
     def _get_dsn(self) -> str:
@@ -29,12 +29,22 @@ class RedisContext:
         return await self.redis.close()
 
     # pylint: disable=redefined-builtin
-    async def set(self, key: str, value):
-        return await self.redis.set(key, value)
+    async def set(self, key: str, value, ex=None):
+        return await self.redis.set(key, value, ex=ex)
 
     async def get(self, key: str):
         return await self.redis.get(key)
 
+    async def mget(self, *keys: str):
+        return await self.redis.mget(keys)
+
+    async def mset(self, mapping: dict):
+        return await self.redis.mset(mapping)
+
+    async def run_script(self, script: str, keys, args=None):
+        # EVALSHA, falling back to SCRIPT LOAD the first time the server sees the script
+        return await self.redis.register_script(script)(keys=keys, args=args)
+
     async def publish(self, channel: str, data: str):
         await self.redis.publish(channel, data)
 